@@ -19,20 +19,32 @@ Experimental probability distributions for stochastic nodes in PyMC.
 The imports from pymc are not fully replicated here: add imports as necessary.
 """
 
-from typing import List, Tuple, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 import pytensor.tensor as pt
-from pymc import ChiSquared, CustomDist
-from pymc.distributions import transforms
-from pymc.distributions.dist_math import check_parameters
+from pymc.distributions.continuous import PositiveContinuous
+from pymc.distributions.dist_math import check_parameters, logpow
 from pymc.distributions.distribution import Continuous
 from pymc.distributions.shape_utils import rv_size_is_none
-from pymc.logprob.utils import CheckParameterValue
 from pymc.pytensorf import floatX
+from pytensor.ifelse import ifelse
+from pytensor.tensor.exceptions import NotScalarConstantError
 from pytensor.tensor.random.op import RandomVariable
 from pytensor.tensor.variable import TensorVariable
-from scipy import stats
+from scipy import special
+
+
+def _scalar_constant_value(var: TensorVariable) -> Optional[float]:
+    """Return the value of a scalar graph constant, or None if `var` is not one"""
+    # get_scalar_constant_value also accepts uniform non-scalar constants, which are left to
+    # the symbolic path so that batched parameters keep their shape through it
+    if var.ndim != 0:
+        return None
+    try:
+        return pt.get_scalar_constant_value(var)
+    except NotScalarConstantError:
+        return None
 
 
 class GenExtremeRV(RandomVariable):
@@ -54,13 +66,37 @@ class GenExtremeRV(RandomVariable):
         xi: np.ndarray,
         size: Tuple[int, ...],
     ) -> np.ndarray:
-        # Notice negative here, since remainder of GenExtreme is based on Coles parametrization
-        return stats.genextreme.rvs(c=-xi, loc=mu, scale=sigma, random_state=rng, size=size)
+        if size is None:
+            size = np.broadcast_shapes(np.shape(mu), np.shape(sigma), np.shape(xi))
+        # Inverse CDF sampling: -log(-log(U)) is a standard Gumbel draw, which is mapped
+        # to ((-log(U)) ** -xi - 1) / xi = expm1(xi * gumbel) / xi when xi != 0
+        gumbel = -np.log(-np.log(rng.uniform(size=size)))
+        if np.ndim(xi) == 0:
+            # Scalar shape parameter: only evaluate the branch that is needed
+            scaled = gumbel if np.isclose(xi, 0) else np.expm1(xi * gumbel) / xi
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scaled = np.where(np.isclose(xi, 0), gumbel, np.expm1(xi * gumbel) / xi)
+        return mu + sigma * scaled
 
 
 gev = GenExtremeRV()
 
 
+def _select_xi_branch(
+    xi: TensorVariable, gumbel_expression: TensorVariable, gev_expression: TensorVariable
+) -> TensorVariable:
+    """Select between the xi == 0 (Gumbel) and xi != 0 expressions of a GEV log(t) / xi term"""
+    # Only emit the branch that is needed when xi is known at graph construction time
+    xi_value = _scalar_constant_value(xi)
+    if xi_value is not None:
+        return gumbel_expression if np.isclose(xi_value, 0) else gev_expression
+    # A scalar xi selects the same branch for every value, so only that branch is evaluated
+    if xi.ndim == 0:
+        return ifelse(pt.isclose(xi, 0), gumbel_expression, gev_expression)
+    return pt.switch(pt.isclose(xi, 0), gumbel_expression, gev_expression)
+
+
 class GenExtreme(Continuous):
     r"""
     Univariate Generalized Extreme Value log-likelihood
@@ -168,17 +204,26 @@ class GenExtreme(Continuous):
         -------
         TensorVariable
         """
+        log_sigma = pt.log(sigma)
+        # log(t) / xi is evaluated with a dummy xi when xi == 0. It is not selected then,
+        # but its zero gradient would still become nan when propagated through 1 / xi
+        gev_xi = pt.switch(pt.isclose(xi, 0), 1.0, xi)
+
         scaled = (value - mu) / sigma
+        xi_scaled = xi * scaled
+        t = 1 + xi_scaled
+        in_support = pt.gt(t, 0.0)
+        # t ** (-1 / xi) is written as exp(-log(t) / xi) so that a single log1p is evaluated.
+        # Outside the support the log is taken of a dummy value, which is masked out below.
+        log_t = pt.log1p(pt.switch(in_support, xi_scaled, 0.0))
 
-        logp_expression = pt.switch(
-            pt.isclose(xi, 0),
-            -pt.log(sigma) - scaled - pt.exp(-scaled),
-            -pt.log(sigma)
-            - ((xi + 1) / xi) * pt.log1p(xi * scaled)
-            - pt.pow(1 + xi * scaled, -1 / xi),
-        )
+        # At xi == 0 log(t) / xi is replaced by its first order expansion in xi, which equals
+        # the Gumbel limit and keeps the gradient with respect to xi
+        log_t_over_xi = _select_xi_branch(xi, scaled - 0.5 * xi * scaled**2, log_t / gev_xi)
+
+        logp_expression = -log_sigma - log_t - log_t_over_xi - pt.exp(-log_t_over_xi)
 
-        logp = pt.switch(pt.gt(1 + xi * scaled, 0.0), logp_expression, -np.inf)
+        logp = pt.switch(in_support, logp_expression, -np.inf)
 
         return check_parameters(
             logp, sigma > 0, pt.and_(xi > -1, xi < 1), msg="sigma > 0 or -1 < xi < 1"
@@ -200,12 +245,17 @@ class GenExtreme(Continuous):
         -------
         TensorVariable
         """
+        gev_xi = pt.switch(pt.isclose(xi, 0), 1.0, xi)
+
         scaled = (value - mu) / sigma
-        logc_expression = pt.switch(
-            pt.isclose(xi, 0), -pt.exp(-scaled), -pt.pow(1 + xi * scaled, -1 / xi)
-        )
+        xi_scaled = xi * scaled
+        t = 1 + xi_scaled
+        in_support = pt.gt(t, 0.0)
+        log_t = pt.log1p(pt.switch(in_support, xi_scaled, 0.0))
 
-        logc = pt.switch(1 + xi * (value - mu) / sigma > 0, logc_expression, -np.inf)
+        log_t_over_xi = _select_xi_branch(xi, scaled - 0.5 * xi * scaled**2, log_t / gev_xi)
+
+        logc = pt.switch(in_support, -pt.exp(-log_t_over_xi), -np.inf)
 
         return check_parameters(
             logc, sigma > 0, pt.and_(xi > -1, xi < 1), msg="sigma > 0 or -1 < xi < 1"
@@ -215,13 +265,33 @@ class GenExtreme(Continuous):
         r"""
         Using the mode, as the mean can be infinite when :math:`\xi > 1`
         """
-        mode = pt.switch(pt.isclose(xi, 0), mu, mu + sigma * (pt.pow(1 + xi, -xi) - 1) / xi)
+        mode = pt.switch(pt.isclose(xi, 0), mu, mu + sigma * pt.expm1(-xi * pt.log1p(xi)) / xi)
         if not rv_size_is_none(size):
             mode = pt.full(size, mode)
         return mode
 
 
-class Chi:
+class ChiRV(RandomVariable):
+    name: str = "chi"
+    ndim_supp: int = 0
+    ndims_params: List[int] = [0]
+    dtype: str = "floatX"
+    _print_name: Tuple[str, str] = ("Chi", "\\operatorname{Chi}")
+
+    @classmethod
+    def rng_fn(
+        cls,
+        rng: Union[np.random.RandomState, np.random.Generator],
+        nu: np.ndarray,
+        size: Tuple[int, ...],
+    ) -> np.ndarray:
+        return np.sqrt(rng.chisquare(nu, size=size))
+
+
+chi = ChiRV()
+
+
+class Chi(PositiveContinuous):
     r"""
     :math:`\chi` log-likelihood.
 
@@ -269,21 +339,64 @@ class Chi:
             x = Chi('x', nu=1)
     """
 
-    @staticmethod
-    def chi_dist(nu: TensorVariable, size: TensorVariable) -> TensorVariable:
-        return pt.math.sqrt(ChiSquared.dist(nu=nu, size=size))
-
-    def __new__(cls, name, nu, **kwargs):
-        if "observed" not in kwargs:
-            kwargs.setdefault("transform", transforms.log)
-        return CustomDist(name, nu, dist=cls.chi_dist, class_name="Chi", **kwargs)
+    rv_op = chi
 
     @classmethod
     def dist(cls, nu, **kwargs):
-        return CustomDist.dist(nu, dist=cls.chi_dist, class_name="Chi", **kwargs)
+        nu = pt.as_tensor_variable(floatX(nu))
+        return super().dist([nu], **kwargs)
+
+    def moment(rv, size, nu):
+        mean = pt.sqrt(2.0) * pt.exp(pt.gammaln((nu + 1) / 2) - pt.gammaln(nu / 2))
+        if not rv_size_is_none(size):
+            mean = pt.full(size, mean)
+        return mean
+
+    def logp(value, nu):
+        res = (
+            logpow(value, nu - 1)
+            - 0.5 * pt.sqr(value)
+            - (0.5 * nu - 1) * pt.log(2.0)
+            - pt.gammaln(0.5 * nu)
+        )
+        res = pt.switch(pt.ge(value, 0.0), res, -np.inf)
+
+        return check_parameters(res, nu > 0, msg="nu > 0")
+
+    def logcdf(value, nu):
+        res = pt.switch(
+            pt.lt(value, 0.0),
+            -np.inf,
+            pt.log(pt.gammainc(0.5 * nu, 0.5 * pt.sqr(value))),
+        )
+
+        return check_parameters(res, nu > 0, msg="nu > 0")
+
+
+class MaxwellRV(RandomVariable):
+    name: str = "maxwell"
+    ndim_supp: int = 0
+    ndims_params: List[int] = [0]
+    dtype: str = "floatX"
+    _print_name: Tuple[str, str] = ("Maxwell", "\\operatorname{Maxwell}")
+
+    @classmethod
+    def rng_fn(
+        cls,
+        rng: Union[np.random.RandomState, np.random.Generator],
+        a: np.ndarray,
+        size: Tuple[int, ...],
+    ) -> np.ndarray:
+        if size is None:
+            size = np.shape(a)
+        # A Maxwell variate is a scaled chi variate with 3 degrees of freedom
+        return a * np.sqrt(rng.chisquare(3, size=size))
+
+
+maxwell = MaxwellRV()
 
 
-class Maxwell:
+class Maxwell(PositiveContinuous):
     R"""
     The Maxwell-Boltzmann distribution
 
@@ -325,33 +438,34 @@ class Maxwell:
 
     """
 
-    @staticmethod
-    def maxwell_dist(a: TensorVariable, size: TensorVariable) -> TensorVariable:
-        if rv_size_is_none(size):
-            size = a.shape
+    rv_op = maxwell
 
-        a = CheckParameterValue("a > 0")(a, pt.all(pt.gt(a, 0)))
+    @classmethod
+    def dist(cls, a, **kwargs):
+        a = pt.as_tensor_variable(floatX(a))
+        return super().dist([a], **kwargs)
 
-        return Chi.dist(nu=3, size=size) * a
+    def moment(rv, size, a):
+        mean = 2 * a * np.sqrt(2 / np.pi)
+        if not rv_size_is_none(size):
+            mean = pt.full(size, mean)
+        return mean
 
-    def __new__(cls, name, a, **kwargs):
-        return CustomDist(
-            name,
-            a,
-            dist=cls.maxwell_dist,
-            class_name="Maxwell",
-            **kwargs,
-        )
+    def logp(value, a):
+        res = 0.5 * np.log(2 / np.pi) + 2 * pt.log(value) - 0.5 * pt.sqr(value / a) - 3 * pt.log(a)
+        res = pt.switch(pt.ge(value, 0.0), res, -np.inf)
 
-    @classmethod
-    def dist(cls, a, **kwargs):
-        return CustomDist.dist(
-            a,
-            dist=cls.maxwell_dist,
-            class_name="Maxwell",
-            **kwargs,
+        return check_parameters(res, a > 0, msg="a > 0")
+
+    def logcdf(value, a):
+        res = pt.switch(
+            pt.lt(value, 0.0),
+            -np.inf,
+            pt.log(pt.gammainc(1.5, 0.5 * pt.sqr(value / a))),
         )
 
+        return check_parameters(res, a > 0, msg="a > 0")
+
 
 class GeneralizedNormalRV(RandomVariable):
     name: str = "Generalized Normal"
@@ -372,7 +486,14 @@ class GeneralizedNormalRV(RandomVariable):
         beta: np.ndarray,
         size: Tuple[int, ...],
     ) -> np.ndarray:
-        return stats.gennorm.rvs(beta, loc=loc, scale=alpha, size=size, random_state=rng)
+        if size is None:
+            size = np.broadcast_shapes(np.shape(loc), np.shape(alpha), np.shape(beta))
+        # If G ~ Gamma(1/beta, 1) then S * G ** (1/beta), with S a random sign, is a
+        # standard generalized normal draw (Nardon & Pianca, 2009)
+        inv_beta = 1.0 / beta
+        magnitude = rng.standard_gamma(inv_beta, size=size) ** inv_beta
+        sign = np.where(rng.random(size=size) < 0.5, -1.0, 1.0)
+        return loc + alpha * sign * magnitude
 
 # Create the actual `RandomVariable` `Op`...
 gennorm = GeneralizedNormalRV()
@@ -467,18 +588,39 @@ class GeneralizedNormal(Continuous):
 
         return super().dist([mu, alpha, beta], **kwargs)
 
+    @staticmethod
+    def _absz_pow_beta(value, mu, alpha, beta):
+        r"""
+        Compute :math:`|(x - \mu)/\alpha|^\beta`, shared by logp and logcdf so that
+        the two graphs merge when both are evaluated together
+        """
+        # pow is fused into the elemwise kernel like exp and log are, and unlike
+        # exp(beta * log|z|) its gradient is finite at value == mu
+        return pt.pow(pt.abs(value - mu) / alpha, beta)
 
     # moment here returns the mean
     def moment(rv, size, mu, alpha, beta):
-        moment, *_ = pt.broadcast_arrays(mu, alpha, beta)
-        if not rv_size_is_none(size):
-            moment = pt.full(size, moment)
-        return moment
+        if rv_size_is_none(size):
+            size = pt.broadcast_shape(mu, alpha, beta)
+        return pt.full(size, mu)
 
     def logp(value, mu, alpha, beta):
-
-        z = (value-mu)/alpha
-        lp = pt.log(0.5*beta) - pt.log(alpha) - pt.gammaln(1.0/beta) - pt.pow(pt.abs(z), beta)
+        # Evaluate the normalisation terms at graph construction time for constant parameters
+        alpha_value = _scalar_constant_value(alpha)
+        beta_value = _scalar_constant_value(beta)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if alpha_value is None:
+                log_alpha = pt.log(alpha)
+            else:
+                log_alpha = pt.constant(floatX(np.log(alpha_value)))
+            if beta_value is None:
+                log_norm_beta = pt.log(0.5 * beta) - pt.gammaln(1.0 / beta)
+            else:
+                log_norm_beta = pt.constant(
+                    floatX(np.log(0.5 * beta_value) - special.gammaln(1.0 / beta_value))
+                )
+
+        lp = log_norm_beta - log_alpha - GeneralizedNormal._absz_pow_beta(value, mu, alpha, beta)
 
         return check_parameters(
             lp,
@@ -503,18 +645,16 @@ class GeneralizedNormal(Continuous):
              Shape parameter
 
         """
+        # This follows the Wikipedia entry for the function, 1/2 + sign(x - mu) P(1/beta, z^beta)/2,
+        # written in terms of the upper regularised incomplete gamma function Q = 1 - P as
+        # scipy does: the cdf is 1 - Q/2 in the right tail and Q/2 in the left tail. This
+        # avoids the cancellation in 1/2 - P/2 when P is close to 1 far into the left tail
+        q = pt.gammaincc(1.0 / beta, GeneralizedNormal._absz_pow_beta(value, mu, alpha, beta))
+        logcdf = pt.switch(pt.gt(value, mu), pt.log1p(-0.5 * q), pt.log(0.5) + pt.log(q))
 
-        
-        z = pt.abs((value-mu)/alpha)
-        c =  pt.sign(value-mu)
-
-        # This follows the Wikipedia entry for the function - scipy has
-        # opted for a slightly different version using gammaincc instead.
-        # Note that on the Wikipedia page the unnormalised \gamma function
-        # is used, while gammainc is a normalised function
-        cdf = 0.5 + 0.5*pt.sign(value-mu)*pt.gammainc(1.0/beta, pt.pow(z, beta))
-
-        return pt.log(cdf)
-        
-        
-
+        return check_parameters(
+            logcdf,
+            alpha > 0,
+            beta > 0,
+            msg="alpha > 0, beta > 0",
+        )
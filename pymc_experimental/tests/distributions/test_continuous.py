@@ -13,6 +13,8 @@
 #   limitations under the License.
 import numpy as np
 import pymc as pm
+import pytensor
+import pytensor.tensor as pt
 
 # general imports
 import pytest
@@ -81,6 +83,61 @@ class TestGenExtremeClass:
             decimal=select_by_precision(float64=6, float32=2),
         )
 
+    @pytest.mark.parametrize("xi", [-0.5, 0, 0.5])
+    def test_logp_logcdf_constant_xi(self, xi):
+        value = np.linspace(-1.5, 1.5, 7)
+        dist = GenExtreme.dist(mu=0.2, sigma=1.3, xi=xi)
+        np.testing.assert_allclose(
+            pm.logp(dist, value).eval(),
+            sp.genextreme.logpdf(value, c=-xi, loc=0.2, scale=1.3),
+        )
+        np.testing.assert_allclose(
+            pm.logcdf(dist, value).eval(),
+            sp.genextreme.logcdf(value, c=-xi, loc=0.2, scale=1.3),
+        )
+
+    @pytest.mark.parametrize("xi", [-0.3, 0, 0.3])
+    def test_logp_logcdf_grad(self, xi):
+        value = np.linspace(-1.5, 1.5, 7)
+        params = pt.scalars("mu", "sigma", "xi")
+        dist = GenExtreme.dist(*params)
+        point = np.array([0.2, 1.3, xi])
+        eps = 1e-5
+        for logp in (pm.logp(dist, value).sum(), pm.logcdf(dist, value).sum()):
+            logp_fn = pytensor.function(params, logp)
+            grad_fn = pytensor.function(params, pytensor.grad(logp, params))
+            # Central finite difference in each of mu, sigma and xi
+            expected = [
+                (logp_fn(*(point + step)) - logp_fn(*(point - step))) / (2 * eps)
+                for step in np.eye(3) * eps
+            ]
+            np.testing.assert_allclose(grad_fn(*point), expected, rtol=1e-5)
+
+    @pytest.mark.parametrize("xi", [-0.5, 0, 0.5])
+    def test_logp_logcdf_numba_mode(self, xi):
+        pytest.importorskip("numba")
+        value = pt.vector("value")
+        xi_ = pt.scalar("xi")
+        dist = GenExtreme.dist(mu=0.2, sigma=1.3, xi=xi_)
+        logp = pm.logp(dist, value)
+        logcdf = pm.logcdf(dist, value)
+        # The gradient is included because it introduces parameter-only divisions by xi,
+        # which must not raise when xi == 0
+        dxi = pytensor.grad(logp.sum(), xi_)
+        fn = pytensor.function([value, xi_], [logp, logcdf, dxi], mode="NUMBA")
+
+        test_value = np.linspace(-1.5, 1.5, 7).astype(pytensor.config.floatX)
+        logp_eval, logcdf_eval, dxi_eval = fn(test_value, xi)
+        np.testing.assert_allclose(
+            dxi_eval, pytensor.function([value, xi_], dxi)(test_value, xi), rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            logp_eval, sp.genextreme.logpdf(test_value, c=-xi, loc=0.2, scale=1.3), rtol=1e-5
+        )
+        np.testing.assert_allclose(
+            logcdf_eval, sp.genextreme.logcdf(test_value, c=-xi, loc=0.2, scale=1.3), rtol=1e-5
+        )
+
     @pytest.mark.parametrize(
         "mu, sigma, xi, size, expected",
         [
@@ -160,6 +217,33 @@ class TestChiClass:
             lambda value, nu: sp.chi.logcdf(value, df=nu),
         )
 
+    @pytest.mark.parametrize(
+        "nu, size, expected",
+        [
+            (1, None, np.sqrt(2 / np.pi)),
+            (3, 5, np.full(5, 2 * np.sqrt(2 / np.pi))),
+            (np.arange(1, 4), None, sp.chi.mean(df=np.arange(1, 4))),
+            (np.arange(1, 4), (2, 3), np.full((2, 3), sp.chi.mean(df=np.arange(1, 4)))),
+        ],
+    )
+    def test_chi_moment(self, nu, size, expected):
+        with pm.Model() as model:
+            Chi("x", nu=nu, size=size)
+        assert_moment_is_expected(model, expected)
+
+
+class TestChi(BaseTestDistributionRandom):
+    pymc_dist = Chi
+    pymc_dist_params = {"nu": 3.0}
+    expected_rv_op_params = {"nu": 3.0}
+    reference_dist_params = {"df": 3.0}
+    reference_dist = seeded_scipy_distribution_builder("chi")
+    tests_to_run = [
+        "check_pymc_params_match_rv_op",
+        "check_pymc_draws_match_reference",
+        "check_rv_size",
+    ]
+
 
 class TestMaxwell:
     """
@@ -183,8 +267,34 @@ class TestMaxwell:
             lambda value, a: sp.maxwell.logcdf(value, scale=a),
         )
 
+    @pytest.mark.parametrize(
+        "a, size, expected",
+        [
+            (1, None, 2 * np.sqrt(2 / np.pi)),
+            (2, 5, np.full(5, 4 * np.sqrt(2 / np.pi))),
+            (np.arange(1, 4), None, 2 * np.arange(1, 4) * np.sqrt(2 / np.pi)),
+        ],
+    )
+    def test_maxwell_moment(self, a, size, expected):
+        with pm.Model() as model:
+            Maxwell("x", a=a, size=size)
+        assert_moment_is_expected(model, expected)
+
+
+class TestMaxwellRandom(BaseTestDistributionRandom):
+    pymc_dist = Maxwell
+    pymc_dist_params = {"a": 2.0}
+    expected_rv_op_params = {"a": 2.0}
+    reference_dist_params = {"scale": 2.0}
+    reference_dist = seeded_scipy_distribution_builder("maxwell")
+    tests_to_run = [
+        "check_pymc_params_match_rv_op",
+        "check_pymc_draws_match_reference",
+        "check_rv_size",
+    ]
 
-class TestGeneralizedNormal:
+
+class TestGeneralizedNormalClass:
     """
     Wrapper class so that tests of experimental additions can be dropped into
     PyMC directly on adoption.
@@ -192,28 +302,65 @@ class TestGeneralizedNormal:
 
     def test_logp(self):
         check_logp(
-            pymc_dist=GeneralizedNormal,
-            domain=R,
-            paradomains={"mu": R, "alpha": Rplus, "beta": Rplus},
-            scipy_logp=lambda value, mu, alpha, beta: sp.gennorm.logpdf(value, beta, loc=mu, scale=alpha),
+            GeneralizedNormal,
+            R,
+            # Large beta makes the logp so large that only its relative precision is meaningful
+            {"mu": R, "alpha": Rplusbig, "beta": Domain([0, 0.5, 1, 2, 5, np.inf])},
+            lambda value, mu, alpha, beta: sp.gennorm.logpdf(value, beta, loc=mu, scale=alpha),
         )
 
     def test_logcdf(self):
         check_logcdf(
-            pymc_dist=GeneralizedNormal,
-            domain=R,
-            paradomains={"mu": R, "alpha": Rplus, "beta": Rplus},
-            scipy_logcdf=lambda value, mu, alpha, beta: sp.gennorm.logcdf(value, beta, loc=mu, scale=alpha),
+            GeneralizedNormal,
+            R,
+            {"mu": R, "alpha": Rplus, "beta": Rplus},
+            lambda value, mu, alpha, beta: sp.gennorm.logcdf(value, beta, loc=mu, scale=alpha),
         )
 
+    @pytest.mark.parametrize(
+        "alpha, beta",
+        [
+            (0.7, 1.5),
+            (np.array([0.5, 1.0, 2.0]), np.array([0.8, 2.0, 4.0])),
+        ],
+    )
+    def test_logp_constant_params(self, alpha, beta):
+        # Scalar constants have their normalisation folded at graph construction time,
+        # non-uniform vector constants go through the symbolic expression
+        value = np.array([-1.2, 0.3, 2.5])
+        dist = GeneralizedNormal.dist(mu=0.4, alpha=alpha, beta=beta)
+        np.testing.assert_allclose(
+            pm.logp(dist, value).eval(),
+            sp.gennorm.logpdf(value, beta, loc=0.4, scale=alpha),
+        )
+
+    def test_logcdf_left_tail(self):
+        # The lower tail probability is far below the float64 resolution of 1 - q
+        value = np.array([0.01, 1.5])
+        dist = GeneralizedNormal.dist(mu=2.1, alpha=0.1, beta=2.0)
+        np.testing.assert_allclose(
+            pm.logcdf(dist, value).eval(),
+            sp.gennorm.logcdf(value, 2.0, loc=2.1, scale=0.1),
+            rtol=1e-6,
+        )
 
+    @pytest.mark.parametrize(
+        "mu, alpha, beta, size, expected",
+        [
+            (0, 1, 2, None, 0),
+            (1, 1, 2, 5, np.full(5, 1)),
+            (np.arange(3), 1, 2, None, np.arange(3)),
+            (np.arange(3), np.ones((2, 1)), 2, None, np.broadcast_to(np.arange(3), (2, 3))),
+            (0, 1, np.arange(1, 4), None, np.zeros(3)),
+            (np.arange(3), 2, 0.5, (4, 3), np.full((4, 3), np.arange(3))),
+        ],
+    )
     def test_gennorm_moment(self, mu, alpha, beta, size, expected):
         with pm.Model() as model:
             GeneralizedNormal("x", mu=mu, alpha=alpha, beta=beta, size=size)
         assert_moment_is_expected(model, expected)
 
 
-
 class TestGeneralizedNormal(BaseTestDistributionRandom):
     pymc_dist = GeneralizedNormal
     pymc_dist_params = {"mu": 0, "alpha": 1, "beta": 2.0}